@@ -29,10 +29,12 @@ import aiohttp
 import sqlmodel
 
 import atr.db as db
+import atr.db.interaction as interaction
 import atr.log as log
 import atr.models.helpers as helpers
 import atr.models.schema as schema
 import atr.models.sql as sql
+import atr.user as user
 import atr.util as util
 
 _WHIMSY_COMMITTEE_INFO_URL: Final[str] = "https://whimsy.apache.org/public/committee-info.json"
@@ -319,6 +321,10 @@ async def update_metadata() -> tuple[int, int]:
             added_count += added
             updated_count += updated
 
+    # Committee memberships may have changed
+    interaction.user_committees_cache_invalidate()
+    user.projects_cache_invalidate()
+
     return added_count, updated_count
 
 
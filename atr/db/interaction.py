@@ -15,11 +15,17 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import asyncio
 import contextlib
+import dataclasses
 import datetime
 import enum
-from collections.abc import AsyncGenerator, Sequence
-from typing import Any, Final
+import functools
+import re
+import time
+import types
+from collections.abc import AsyncGenerator, Mapping, Sequence
+from typing import Any, Final, Literal
 
 import packaging.version as version
 import sqlalchemy
@@ -37,17 +43,59 @@ import atr.util as util
 
 # TEST_MID: Final[str | None] = "CAH5JyZo8QnWmg9CwRSwWY=GivhXW4NiLyeNJO71FKdK81J5-Uw@mail.gmail.com"
 TEST_MID: Final[str | None] = None
-_THREAD_URLS_FOR_DEVELOPMENT: Final[dict[str, str]] = {
-    "CAH5JyZo8QnWmg9CwRSwWY=GivhXW4NiLyeNJO71FKdK81J5-Uw@mail.gmail.com": "https://lists.apache.org/thread/z0o7xnjnyw2o886rxvvq2ql4rdfn754w",
-    "818a44a3-6984-4aba-a650-834e86780b43@apache.org": "https://lists.apache.org/thread/619hn4x796mh3hkk3kxg1xnl48dy2s64",
-    "CAA9ykM+bMPNk=BOF9hj0O+mjN1igppOJ+pKdZHcAM0ddVi+5_w@mail.gmail.com": "https://lists.apache.org/thread/x0m3p2xqjvflgtkb6oxqysm36cr9l5mg",
-    "CAFHDsVzgtfboqYF+a3owaNf+55MUiENWd3g53mU4rD=WHkXGwQ@mail.gmail.com": "https://lists.apache.org/thread/brj0k3g8pq63g8f7xhmfg2rbt1240nts",
-    "CAMomwMrvKTQK7K2-OtZTrEO0JjXzO2g5ynw3gSoks_PXWPZfoQ@mail.gmail.com": "https://lists.apache.org/thread/y5rqp5qk6dmo08wlc3g20n862hznc9m8",
-    "CANVKqzfLYj6TAVP_Sfsy5vFbreyhKskpRY-vs=F7aLed+rL+uA@mail.gmail.com": "https://lists.apache.org/thread/oy969lhh6wlzd51ovckn8fly9rvpopwh",
-    "CAH4123ZwGtkwszhEU7qnMByLa-yvyKz2W+DjH_UChPMuzaa54g@mail.gmail.com": "https://lists.apache.org/thread/7111mqyc25sfqxm6bf4ynwhs0bk0r4ys",
-    "CADL1oArKFcXvNb1MJfjN=10-yRfKxgpLTRUrdMM1R7ygaTkdYQ@mail.gmail.com": "https://lists.apache.org/thread/d7119h2qm7jrd5zsbp8ghkk0lpvnnxnw",
-    "a1507118-88b1-4b7b-923e-7f2b5330fc01@apache.org": "https://lists.apache.org/thread/gzjd2jv7yod5sk5rgdf4x33g5l3fdf5o",
-}
+
+# Matches runs of digits or of anything else except the separators
+_VERSION_TOKEN: Final[re.Pattern[str]] = re.compile(r"(\d+)|([^.+-]+)")
+
+# Validates a workflow ref and extracts the repository name and workflow path
+# The trailing @ is greedy, so a path containing @ splits at the last one
+_WORKFLOW_REF_PATTERN: Final[re.Pattern[str]] = re.compile(r"apache/(?P<repo>[^/]+)/(?P<path>\.github/workflows/.+)@")
+
+# GitHub actor to ASF UID mappings change rarely, so an hour of caching is safe
+_GITHUB_TO_APACHE_TTL_SECONDS: Final[int] = 3600
+_GITHUB_TO_APACHE_MAX_ENTRIES: Final[int] = 10_000
+_github_to_apache_cache: dict[int, tuple[str, float]] = {}
+_github_to_apache_locks: dict[int, asyncio.Lock] = {}
+
+# Committee roles are queried on nearly every authenticated request, so cache briefly
+_USER_COMMITTEES_TTL_SECONDS: Final[int] = 60
+_USER_COMMITTEES_MAX_ENTRIES: Final[int] = 50_000
+_user_committees_cache: dict[tuple[int, str], tuple[dict[str, "CommitteeRoles"], float]] = {}
+_user_committees_epoch: int = 0
+
+# Trusted project resolutions are static within a deploy, short of policy edits
+_TRUSTED_PROJECT_TTL_SECONDS: Final[int] = 300
+_TRUSTED_PROJECT_MAX_ENTRIES: Final[int] = 1024
+_trusted_project_cache: dict[tuple[int, str, str, str], tuple[sql.Project, float]] = {}
+_trusted_project_epoch: int = 0
+_trusted_project_lock: Final[asyncio.Lock] = asyncio.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class CommitteeRoles:
+    committee: sql.Committee
+    member: bool
+    committer: bool
+
+    @property
+    def participant(self) -> bool:
+        return self.member or self.committer
+
+
+class TrustedProjectPhase(enum.Enum):
+    COMPOSE = "compose"
+    VOTE = "vote"
+    FINISH = "finish"
+
+
+# Maps each phase to the github_*_workflow_path column it searches
+_PHASE_WORKFLOW_PATH_COLUMN: Final[Mapping[TrustedProjectPhase, Any]] = types.MappingProxyType(
+    {
+        TrustedProjectPhase.COMPOSE: sql.ReleasePolicy.github_compose_workflow_path,
+        TrustedProjectPhase.VOTE: sql.ReleasePolicy.github_vote_workflow_path,
+        TrustedProjectPhase.FINISH: sql.ReleasePolicy.github_finish_workflow_path,
+    }
+)
 
 
 class ApacheUserMissingError(RuntimeError):
@@ -69,46 +117,31 @@ class ReleasePolicyNotFoundError(RuntimeError):
     pass
 
 
-class TrustedProjectPhase(enum.Enum):
-    COMPOSE = "compose"
-    VOTE = "vote"
-    FINISH = "finish"
-
-
-async def all_releases(project: sql.Project) -> list[sql.Release]:
-    """Get all releases for the project, sorted by version."""
-    query = sqlmodel.select(sql.Release).where(sql.Release.project_name == project.name)
+async def all_releases(
+    project: sql.Project,
+    sort: Literal["created", "version"] = "version",
+    _skip_project_load: bool = False,
+) -> list[sql.Release]:
+    """Get all releases for the project, newest first by version or creation."""
+    query = (
+        sqlmodel.select(sql.Release)
+        .where(sql.Release.project_name == project.name)
+        .order_by(sql.validate_instrumented_attribute(sql.Release.created).desc())
+    )
+    if not _skip_project_load:
+        query = query.options(db.select_in_load(sql.Release.project))
 
-    results = []
     async with db.session() as data:
-        for result in (await data.execute(query)).all():
-            release = result[0]
-            results.append(release)
+        results = list((await data.execute(query)).scalars().all())
 
-    for release in results:
-        release.project = project
+    if _skip_project_load:
+        for release in results:
+            # Presetting the relationship spares both an eager and a lazy load
+            release.project = project
 
-    try:
-        # This rejects any non PEP 440 versions
-        results.sort(key=lambda r: version.Version(r.version), reverse=True)
-    except Exception as e:
-        # Usually packaging.version.InvalidVersion
-        if not isinstance(e, version.InvalidVersion):
-            log.warning(f"Error sorting releases: {type(e)}: {e!s}")
-
-        def sort_key(release: sql.Release) -> tuple[tuple[int, int | str], ...]:
-            parts = []
-            v = release.version.replace("+", ".").replace("-", ".")
-            for part in v.split("."):
-                try:
-                    # Numeric parts: (0, number) to sort before strings
-                    parts.append((0, int(part)))
-                except ValueError:
-                    # String parts: (1, string) to sort after numbers
-                    parts.append((1, part))
-            return tuple(parts)
-
-        results.sort(key=sort_key, reverse=True)
+    if sort == "version":
+        # Compute each key once, falling back per version rather than wholesale
+        results.sort(key=lambda r: _version_sort_key(r.version), reverse=True)
     return results
 
 
@@ -187,48 +220,54 @@ async def trusted_jwt(publisher: str, jwt: str, phase: TrustedProjectPhase) -> t
     if publisher != "github":
         raise InteractionError(f"Publisher {publisher} not supported")
     payload = await jwtoken.verify_github_oidc(jwt)
-    asf_uid = await ldap.github_to_apache(payload["actor_id"])
+    asf_uid = await _cached_github_to_apache(payload["actor_id"])
     project = await _trusted_project(payload["repository"], payload["workflow_ref"], phase)
     return payload, asf_uid, project
 
 
 async def has_failing_checks(release: sql.Release, revision_number: str, caller_data: db.Session | None = None) -> bool:
     async with db.ensure_session(caller_data) as data:
-        query = (
-            sqlmodel.select(sqlalchemy.func.count())
-            .select_from(sql.CheckResult)
-            .where(
+        # EXISTS stops at the first failure, unlike COUNT(*)
+        query = sqlmodel.select(
+            sqlalchemy.exists().where(
                 sql.CheckResult.release_name == release.name,
                 sql.CheckResult.revision_number == revision_number,
                 sql.CheckResult.status == sql.CheckResultStatus.FAILURE,
             )
         )
         result = await data.execute(query)
-        return result.scalar_one() > 0
+        return bool(result.scalar())
 
 
 async def latest_info(project_name: str, version_name: str) -> tuple[str, str, datetime.datetime] | None:
     """Get the name, editor, and timestamp of the latest revision."""
     release_name = sql.release_name(project_name, version_name)
+    via = sql.validate_instrumented_attribute
+    query = (
+        sqlmodel.select(via(sql.Revision.number), via(sql.Revision.asfuid), via(sql.Revision.created))
+        .where(sql.Revision.release_name == release_name)
+        .order_by(via(sql.Revision.seq).desc())
+        .limit(1)
+    )
     async with db.session() as data:
-        # TODO: No need to get release here
-        # Just use maximum seq from revisions
-        release = await data.release(name=release_name, _project=True).demand(
-            RuntimeError(f"Release {release_name} does not exist")
-        )
-        if release.latest_revision_number is None:
-            return None
-        revision = await data.revision(release_name=release_name, number=release.latest_revision_number).get()
-        if not revision:
-            return None
-    return revision.number, revision.asfuid, revision.created
+        row = (await data.execute(query)).one_or_none()
+    if row is None:
+        return None
+    return row.number, row.asfuid, row.created
 
 
 async def latest_revision(release: sql.Release) -> sql.Revision | None:
     if release.latest_revision_number is None:
         return None
+    via = sql.validate_instrumented_attribute
+    query = (
+        sqlmodel.select(sql.Revision)
+        .where(sql.Revision.release_name == release.name)
+        .order_by(via(sql.Revision.seq).desc())
+        .limit(1)
+    )
     async with db.session() as data:
-        return await data.revision(release_name=release.name, number=release.latest_revision_number).get()
+        return (await data.execute(query)).scalar_one_or_none()
 
 
 async def previews(project: sql.Project) -> list[sql.Release]:
@@ -238,9 +277,7 @@ async def previews(project: sql.Project) -> list[sql.Release]:
 
 async def release_latest_vote_task(release: sql.Release) -> sql.Task | None:
     """Find the most recent VOTE_INITIATE task for this release."""
-    disallowed_statuses = [sql.TaskStatus.QUEUED, sql.TaskStatus.ACTIVE]
-    if util.is_dev_environment():
-        disallowed_statuses = []
+    disallowed_statuses = _latest_vote_disallowed_statuses()
     via = sql.validate_instrumented_attribute
     async with db.session() as data:
         query = (
@@ -259,41 +296,55 @@ async def release_latest_vote_task(release: sql.Release) -> sql.Task | None:
 
 async def releases_by_phase(project: sql.Project, phase: sql.ReleasePhase) -> list[sql.Release]:
     """Get the releases for the project by phase."""
+    return await releases_by_phases(project, [phase])
+
+
+async def releases_by_phases(
+    project: sql.Project,
+    phases: list[sql.ReleasePhase],
+    _skip_project_load: bool = False,
+) -> list[sql.Release]:
+    """Get the releases for the project in any of the given phases."""
 
     query = (
         sqlmodel.select(sql.Release)
         .where(
             sql.Release.project_name == project.name,
-            sql.Release.phase == phase,
+            sql.validate_instrumented_attribute(sql.Release.phase).in_(phases),
         )
         .order_by(sql.validate_instrumented_attribute(sql.Release.created).desc())
     )
+    if not _skip_project_load:
+        query = query.options(db.select_in_load(sql.Release.project))
 
-    results = []
     async with db.session() as data:
-        for result in (await data.execute(query)).all():
-            release = result[0]
-            results.append(release)
+        results = list((await data.execute(query)).scalars().all())
 
-    for release in results:
-        # Don't need to eager load and lose it when the session closes
-        release.project = project
+    if _skip_project_load:
+        for release in results:
+            # Presetting the relationship spares both an eager and a lazy load
+            release.project = project
     return results
 
 
 async def releases_in_progress(project: sql.Project) -> list[sql.Release]:
     """Get the releases in progress for the project."""
-    drafts = await candidate_drafts(project)
-    cands = await candidates(project)
-    prevs = await previews(project)
-    return drafts + cands + prevs
+    phases = [
+        sql.ReleasePhase.RELEASE_CANDIDATE_DRAFT,
+        sql.ReleasePhase.RELEASE_CANDIDATE,
+        sql.ReleasePhase.RELEASE_PREVIEW,
+    ]
+    releases = await releases_by_phases(project, phases)
+    # The query orders by created desc, so a stable sort on phase rank
+    # preserves that ordering within each phase
+    phase_rank = {phase: rank for rank, phase in enumerate(phases)}
+    releases.sort(key=lambda r: phase_rank[r.phase])
+    return releases
 
 
 def task_mid_get(latest_vote_task: sql.Task) -> str | None:
-    if util.is_dev_environment():
-        import atr.db.interaction as interaction
-
-        return interaction.TEST_MID
+    if _is_dev_environment():
+        return TEST_MID
     # TODO: Improve this
 
     result = latest_vote_task.result
@@ -303,17 +354,8 @@ def task_mid_get(latest_vote_task: sql.Task) -> str | None:
 
 
 async def tasks_ongoing(project_name: str, version_name: str, revision_number: str | None = None) -> int:
-    tasks = sqlmodel.select(sqlalchemy.func.count()).select_from(sql.Task)
-    async with db.session() as data:
-        query = tasks.where(
-            sql.Task.project_name == project_name,
-            sql.Task.version_name == version_name,
-            sql.Task.revision_number
-            == (sql.RELEASE_LATEST_REVISION_NUMBER if (revision_number is None) else revision_number),
-            sql.validate_instrumented_attribute(sql.Task.status).in_([sql.TaskStatus.QUEUED, sql.TaskStatus.ACTIVE]),
-        )
-        result = await data.execute(query)
-        return result.scalar_one()
+    count, _ = await tasks_ongoing_revision(project_name, version_name, revision_number)
+    return count
 
 
 async def tasks_ongoing_revision(
@@ -333,6 +375,8 @@ async def tasks_ongoing_revision(
         .label("latest_revision")
     )
 
+    # An index on (project_name, version_name, revision_number, status),
+    # partial on status IN (QUEUED, ACTIVE), would make this predicate index-only
     query = (
         sqlmodel.select(
             sqlalchemy.func.count().label("task_count"),
@@ -354,32 +398,46 @@ async def tasks_ongoing_revision(
         return task_count, latest_revision
 
 
+def trusted_project_cache_invalidate() -> None:
+    """Invalidate cached trusted project resolutions after a policy change."""
+    global _trusted_project_epoch
+    _trusted_project_epoch += 1
+    _trusted_project_cache.clear()
+
+
 async def unfinished_releases(asfuid: str) -> list[tuple[str, str, list[sql.Release]]]:
-    releases: list[tuple[str, str, list[sql.Release]]] = []
+    user_projects = await user.projects(asfuid)
+    user_projects.sort(key=lambda p: p.display_name)
+
+    active_phases = [
+        sql.ReleasePhase.RELEASE_CANDIDATE_DRAFT,
+        sql.ReleasePhase.RELEASE_CANDIDATE,
+        sql.ReleasePhase.RELEASE_PREVIEW,
+    ]
     async with db.session() as data:
-        user_projects = await user.projects(asfuid)
-        user_projects.sort(key=lambda p: p.display_name)
-
-        active_phases = [
-            sql.ReleasePhase.RELEASE_CANDIDATE_DRAFT,
-            sql.ReleasePhase.RELEASE_CANDIDATE,
-            sql.ReleasePhase.RELEASE_PREVIEW,
-        ]
-        for project in user_projects:
-            stmt = (
-                sqlmodel.select(sql.Release)
-                .where(
-                    sql.Release.project_name == project.name,
-                    sql.validate_instrumented_attribute(sql.Release.phase).in_(active_phases),
-                )
-                .options(db.select_in_load(sql.Release.project))
-                .order_by(sql.validate_instrumented_attribute(sql.Release.created).desc())
+        # One query across all of the user's projects, rather than one per project
+        stmt = (
+            sqlmodel.select(sql.Release)
+            .where(
+                sql.validate_instrumented_attribute(sql.Release.project_name).in_(
+                    [project.name for project in user_projects]
+                ),
+                sql.validate_instrumented_attribute(sql.Release.phase).in_(active_phases),
             )
-            result = await data.execute(stmt)
-            active_releases = list(result.scalars().all())
-            if active_releases:
-                active_releases.sort(key=lambda r: r.created, reverse=True)
-                releases.append((project.short_display_name, project.name, active_releases))
+            .options(db.select_in_load(sql.Release.project))
+            .order_by(sql.validate_instrumented_attribute(sql.Release.created).desc())
+        )
+        result = await data.execute(stmt)
+        # The query orders by created desc, so each per-project list is already sorted
+        active_by_project: dict[str, list[sql.Release]] = {}
+        for release in result.scalars().all():
+            active_by_project.setdefault(release.project_name, []).append(release)
+
+    releases: list[tuple[str, str, list[sql.Release]]] = []
+    for project in user_projects:
+        active_releases = active_by_project.get(project.name)
+        if active_releases:
+            releases.append((project.short_display_name, project.name, active_releases))
 
     return releases
 
@@ -393,20 +451,66 @@ async def user_committees(asf_uid: str) -> list[tuple[str, str]]:
 
 # This function cannot go in user.py because it causes a circular import
 async def user_committees_committer(asf_uid: str, caller_data: db.Session | None = None) -> Sequence[sql.Committee]:
-    async with db.ensure_session(caller_data) as data:
-        return await data.committee(has_committer=asf_uid).all()
+    roles = await user_committees_roles(asf_uid, caller_data)
+    return [r.committee for r in roles.values() if r.committer]
 
 
 # This function cannot go in user.py because it causes a circular import
 async def user_committees_member(asf_uid: str, caller_data: db.Session | None = None) -> Sequence[sql.Committee]:
-    async with db.ensure_session(caller_data) as data:
-        return await data.committee(has_member=asf_uid).all()
+    roles = await user_committees_roles(asf_uid, caller_data)
+    return [r.committee for r in roles.values() if r.member]
 
 
 # This function cannot go in user.py because it causes a circular import
 async def user_committees_participant(asf_uid: str, caller_data: db.Session | None = None) -> Sequence[sql.Committee]:
+    roles = await user_committees_roles(asf_uid, caller_data)
+    return [r.committee for r in roles.values()]
+
+
+# This function cannot go in user.py because it causes a circular import
+async def user_committees_roles(asf_uid: str, caller_data: db.Session | None = None) -> dict[str, CommitteeRoles]:
+    """Get every committee in which the user has a role, with role flags, in one query."""
+    key = (_user_committees_epoch, asf_uid)
+    cached = _user_committees_cache.get(key)
+    if (cached is not None) and ((time.time() - cached[1]) < _USER_COMMITTEES_TTL_SECONDS):
+        return dict(cached[0])
+    # Membership is stored as JSON list columns, so one participant query loads
+    # everything needed to derive the member and committer flags in Python
     async with db.ensure_session(caller_data) as data:
-        return await data.committee(has_participant=asf_uid).all()
+        committees = await data.committee(has_participant=asf_uid).all()
+    roles = {
+        committee.name: CommitteeRoles(
+            committee=committee,
+            member=asf_uid in committee.committee_members,
+            committer=asf_uid in committee.committers,
+        )
+        for committee in committees
+    }
+    if len(_user_committees_cache) >= _USER_COMMITTEES_MAX_ENTRIES:
+        _user_committees_cache.clear()
+    _user_committees_cache[key] = (roles, time.time())
+    return dict(roles)
+
+
+def user_committees_cache_invalidate() -> None:
+    """Invalidate cached committee roles after committee data changes."""
+    global _user_committees_epoch
+    _user_committees_epoch += 1
+    _user_committees_cache.clear()
+
+
+async def user_dashboard(
+    asf_uid: str,
+) -> tuple[list[tuple[str, str, list[sql.Release]]], list[tuple[str, str]], list[tuple[str, str]]]:
+    """Get the user's unfinished releases, committees, and projects concurrently."""
+    # Each helper opens its own session, so the queries run on separate
+    # connections rather than serializing on one
+    releases, committees, projects = await asyncio.gather(
+        unfinished_releases(asf_uid),
+        user_committees(asf_uid),
+        user_projects(asf_uid),
+    )
+    return releases, committees, projects
 
 
 async def user_projects(asf_uid: str, caller_data: db.Session | None = None) -> list[tuple[str, str]]:
@@ -414,37 +518,101 @@ async def user_projects(asf_uid: str, caller_data: db.Session | None = None) ->
     return [(p.name, p.display_name) for p in projects]
 
 
+@functools.cache
+def _is_dev_environment() -> bool:
+    # The environment does not change at runtime, so compute this only once
+    return util.is_dev_environment()
+
+
+@functools.cache
+def _latest_vote_disallowed_statuses() -> tuple[sql.TaskStatus, ...]:
+    # Invariant per process, so compute once instead of per invocation
+    if _is_dev_environment():
+        return ()
+    return (sql.TaskStatus.QUEUED, sql.TaskStatus.ACTIVE)
+
+
+@functools.cache
+def _thread_urls_for_development() -> Mapping[str, str]:
+    """Known thread URLs for development messages, built on demand and frozen."""
+    if not _is_dev_environment():
+        return types.MappingProxyType({})
+    return types.MappingProxyType(
+        {
+            "CAH5JyZo8QnWmg9CwRSwWY=GivhXW4NiLyeNJO71FKdK81J5-Uw@mail.gmail.com": "https://lists.apache.org/thread/z0o7xnjnyw2o886rxvvq2ql4rdfn754w",
+            "818a44a3-6984-4aba-a650-834e86780b43@apache.org": "https://lists.apache.org/thread/619hn4x796mh3hkk3kxg1xnl48dy2s64",
+            "CAA9ykM+bMPNk=BOF9hj0O+mjN1igppOJ+pKdZHcAM0ddVi+5_w@mail.gmail.com": "https://lists.apache.org/thread/x0m3p2xqjvflgtkb6oxqysm36cr9l5mg",
+            "CAFHDsVzgtfboqYF+a3owaNf+55MUiENWd3g53mU4rD=WHkXGwQ@mail.gmail.com": "https://lists.apache.org/thread/brj0k3g8pq63g8f7xhmfg2rbt1240nts",
+            "CAMomwMrvKTQK7K2-OtZTrEO0JjXzO2g5ynw3gSoks_PXWPZfoQ@mail.gmail.com": "https://lists.apache.org/thread/y5rqp5qk6dmo08wlc3g20n862hznc9m8",
+            "CANVKqzfLYj6TAVP_Sfsy5vFbreyhKskpRY-vs=F7aLed+rL+uA@mail.gmail.com": "https://lists.apache.org/thread/oy969lhh6wlzd51ovckn8fly9rvpopwh",
+            "CAH4123ZwGtkwszhEU7qnMByLa-yvyKz2W+DjH_UChPMuzaa54g@mail.gmail.com": "https://lists.apache.org/thread/7111mqyc25sfqxm6bf4ynwhs0bk0r4ys",
+            "CADL1oArKFcXvNb1MJfjN=10-yRfKxgpLTRUrdMM1R7ygaTkdYQ@mail.gmail.com": "https://lists.apache.org/thread/d7119h2qm7jrd5zsbp8ghkk0lpvnnxnw",
+            "a1507118-88b1-4b7b-923e-7f2b5330fc01@apache.org": "https://lists.apache.org/thread/gzjd2jv7yod5sk5rgdf4x33g5l3fdf5o",
+        }
+    )
+
+
+async def _cached_github_to_apache(actor_id: int) -> str:
+    """Resolve a GitHub actor ID to an ASF UID, caching to avoid the LDAP round-trip."""
+    cached = _github_to_apache_cache.get(actor_id)
+    if (cached is not None) and ((time.time() - cached[1]) < _GITHUB_TO_APACHE_TTL_SECONDS):
+        return cached[0]
+    # Bound both dicts; holders of a cleared lock are unaffected, and at worst
+    # two tasks then resolve the same actor concurrently
+    if len(_github_to_apache_locks) >= _GITHUB_TO_APACHE_MAX_ENTRIES:
+        _github_to_apache_locks.clear()
+    lock = _github_to_apache_locks.setdefault(actor_id, asyncio.Lock())
+    async with lock:
+        # Another task may have populated the cache while we waited for the lock
+        cached = _github_to_apache_cache.get(actor_id)
+        if (cached is not None) and ((time.time() - cached[1]) < _GITHUB_TO_APACHE_TTL_SECONDS):
+            return cached[0]
+        asf_uid = await ldap.github_to_apache(actor_id)
+        if len(_github_to_apache_cache) >= _GITHUB_TO_APACHE_MAX_ENTRIES:
+            _github_to_apache_cache.clear()
+        _github_to_apache_cache[actor_id] = (asf_uid, time.time())
+        return asf_uid
+
+
 async def _trusted_project(repository: str, workflow_ref: str, phase: TrustedProjectPhase) -> sql.Project:
     # Debugging
     log.info(f"GitHub OIDC JWT payload: {repository} {workflow_ref}")
+    key = (_trusted_project_epoch, repository, workflow_ref, phase.value)
+    cached = _trusted_project_cache.get(key)
+    if (cached is not None) and ((time.time() - cached[1]) < _TRUSTED_PROJECT_TTL_SECONDS):
+        return cached[0]
+    async with _trusted_project_lock:
+        # A burst of JWTs from CI may have populated the cache while we waited
+        cached = _trusted_project_cache.get(key)
+        if (cached is not None) and ((time.time() - cached[1]) < _TRUSTED_PROJECT_TTL_SECONDS):
+            return cached[0]
+        project = await _trusted_project_query(repository, workflow_ref, phase)
+        if len(_trusted_project_cache) >= _TRUSTED_PROJECT_MAX_ENTRIES:
+            _trusted_project_cache.clear()
+        _trusted_project_cache[key] = (project, time.time())
+        return project
+
+
+async def _trusted_project_query(repository: str, workflow_ref: str, phase: TrustedProjectPhase) -> sql.Project:
     repository_name, workflow_path = _trusted_project_checks(repository, workflow_ref)
 
-    rpnf_error = ReleasePolicyNotFoundError(
-        f"Release policy for repository {repository_name} and {phase.value} workflow path {workflow_path} not found"
-    )
+    via = sql.validate_instrumented_attribute
+    workflow_path_column = _PHASE_WORKFLOW_PATH_COLUMN[phase]
     # TODO: If a policy is reused between projects, we can't get the project
+    query = (
+        sqlmodel.select(sql.Project)
+        .join(sql.ReleasePolicy, via(sql.Project.release_policy_id) == via(sql.ReleasePolicy.id))
+        .where(
+            sql.ReleasePolicy.github_repository_name == repository_name,
+            via(workflow_path_column).contains(workflow_path),
+        )
+        .options(db.joined_load(sql.Project.committee))
+    )
     async with db.session() as db_data:
-        match phase:
-            case TrustedProjectPhase.COMPOSE:
-                # Searches in github_*compose*_workflow_path
-                policy = await db_data.release_policy(
-                    github_repository_name=repository_name,
-                    github_compose_workflow_path_has=workflow_path,
-                ).demand(rpnf_error)
-            case TrustedProjectPhase.VOTE:
-                # Searches in github_*vote*_workflow_path
-                policy = await db_data.release_policy(
-                    github_repository_name=repository_name,
-                    github_vote_workflow_path_has=workflow_path,
-                ).demand(rpnf_error)
-            case TrustedProjectPhase.FINISH:
-                # Searches in github_*finish*_workflow_path
-                policy = await db_data.release_policy(
-                    github_repository_name=repository_name,
-                    github_finish_workflow_path_has=workflow_path,
-                ).demand(rpnf_error)
-        project = await db_data.project(release_policy_id=policy.id).demand(
-            InteractionError(f"Project for release policy {policy.id} not found")
+        project = (await db_data.execute(query)).unique().scalar_one_or_none()
+    if project is None:
+        raise ReleasePolicyNotFoundError(
+            f"Release policy for repository {repository_name} and {phase.value} workflow path {workflow_path} not found"
         )
     if project.committee is None:
         raise InteractionError(f"Project {project.name} has no committee")
@@ -454,16 +622,35 @@ async def _trusted_project(repository: str, workflow_ref: str, phase: TrustedPro
     return project
 
 
+def _version_sort_key(version_name: str) -> tuple[int, Any]:
+    """Compute a sort key which collates all PEP 440 versions together."""
+    try:
+        # This rejects any non PEP 440 versions
+        # The rank of 1 sorts them above the fallback when reversed
+        return (1, version.Version(version_name))
+    except Exception as e:
+        # Usually packaging.version.InvalidVersion
+        if not isinstance(e, version.InvalidVersion):
+            log.warning(f"Error parsing version {version_name!r}: {type(e)}: {e!s}")
+
+    # Numeric parts get (0, number) to sort before (1, string) parts
+    return (
+        0,
+        tuple((0, int(m[1])) if m[1] else (1, m[2]) for m in _VERSION_TOKEN.finditer(version_name)),
+    )
+
+
 def _trusted_project_checks(repository: str, workflow_ref: str) -> tuple[str, str]:
+    match = _WORKFLOW_REF_PATTERN.match(workflow_ref)
+    if (match is not None) and repository.startswith("apache/") and workflow_ref.startswith(repository + "/"):
+        return match.group("repo"), match.group("path")
+    # Re-check each condition only on the failure path, for specific errors
     if not repository.startswith("apache/"):
         raise InteractionError("Repository must start with 'apache/'")
-    repository_name = repository.removeprefix("apache/")
     if not workflow_ref.startswith(repository + "/"):
         raise InteractionError(f"Workflow ref must start with repository, got {workflow_ref}")
     workflow_path_at = workflow_ref.removeprefix(repository + "/")
     if "@" not in workflow_path_at:
         raise InteractionError(f"Workflow path must contain '@', got {workflow_path_at}")
     workflow_path = workflow_path_at.rsplit("@", 1)[0]
-    if not workflow_path.startswith(".github/workflows/"):
-        raise InteractionError(f"Workflow path must start with '.github/workflows/', got {workflow_path}")
-    return repository_name, workflow_path
+    raise InteractionError(f"Workflow path must start with '.github/workflows/', got {workflow_path}")
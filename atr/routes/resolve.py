@@ -240,15 +240,13 @@ async def _committees_check(vote_thread_url: str, vote_result_url: str) -> None:
     vote_committee_label = None
     result_committee_label = None
     async for _mid, msg in util.thread_messages(vote_thread_id):
-        if "list_raw" in msg:
-            list_raw = msg["list_raw"]
-            vote_committee_label = list_raw.split(".apache.org", 1)[0].split(".", 1)[-1]
+        if msg.list_raw:
+            vote_committee_label = util.list_committee_label(msg.list_raw)
             break
 
     async for _mid, msg in util.thread_messages(result_thread_id):
-        if "list_raw" in msg:
-            list_raw = msg["list_raw"]
-            result_committee_label = list_raw.split(".apache.org", 1)[0].split(".", 1)[-1]
+        if msg.list_raw:
+            result_committee_label = util.list_committee_label(msg.list_raw)
             break
 
     if vote_committee_label != result_committee_label:
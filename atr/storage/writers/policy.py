@@ -19,6 +19,7 @@
 from __future__ import annotations
 
 import atr.db as db
+import atr.db.interaction as interaction
 import atr.models as models
 import atr.storage as storage
 import atr.util as util
@@ -120,6 +121,8 @@ class CommitteeMember(CommitteeParticipant):
         release_policy.preserve_download_files = policy_data.preserve_download_files
 
         await self.__data.commit()
+        # The workflow path or repository columns may have changed
+        interaction.trusted_project_cache_invalidate()
 
     def __set_default_announce_release_template(
         self,
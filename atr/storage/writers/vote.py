@@ -18,8 +18,12 @@
 # Removing this will cause circular imports
 from __future__ import annotations
 
+import asyncio
+import datetime
 from typing import Literal
 
+import sqlalchemy
+
 import atr.construct as construct
 import atr.db as db
 import atr.db.interaction as interaction
@@ -32,31 +36,36 @@ import atr.util as util
 
 
 class GeneralPublic:
+    __slots__ = ("_data", "_write", "_write_as")
+
     def __init__(
         self,
         write: storage.Write,
         write_as: storage.WriteAsGeneralPublic,
         data: db.Session,
     ):
-        self.__write = write
-        self.__write_as = write_as
-        self.__data = data
-        self.__asf_uid = write.authorisation.asf_uid
+        # Shared state lives here once, rather than being re-assigned with a
+        # name mangled copy per subclass
+        self._write = write
+        self._write_as = write_as
+        self._data = data
 
 
 class FoundationCommitter(GeneralPublic):
+    __slots__ = ("_asf_uid",)
+
     def __init__(self, write: storage.Write, write_as: storage.WriteAsFoundationCommitter, data: db.Session):
         super().__init__(write, write_as, data)
-        self.__write = write
-        self.__write_as = write_as
-        self.__data = data
         asf_uid = write.authorisation.asf_uid
         if asf_uid is None:
             raise storage.AccessError("No ASF UID")
-        self.__asf_uid = asf_uid
+        self._asf_uid = asf_uid
 
 
 class CommitteeParticipant(FoundationCommitter):
+    # The write_as is kept per class because its type narrows at each level
+    __slots__ = ("__write_as", "_committee_name")
+
     def __init__(
         self,
         write: storage.Write,
@@ -65,14 +74,8 @@ class CommitteeParticipant(FoundationCommitter):
         committee_name: str,
     ):
         super().__init__(write, write_as, data)
-        self.__write = write
         self.__write_as = write_as
-        self.__data = data
-        asf_uid = write.authorisation.asf_uid
-        if asf_uid is None:
-            raise storage.AccessError("No ASF UID")
-        self.__asf_uid = asf_uid
-        self.__committee_name = committee_name
+        self._committee_name = committee_name
 
     async def send_user_vote(
         self,
@@ -94,33 +97,33 @@ class CommitteeParticipant(FoundationCommitter):
 
         # Arguments for the task to cast a vote
         email_recipient = latest_vote_task.task_args["email_to"]
-        email_sender = f"{self.__asf_uid}@apache.org"
+        email_sender = f"{self._asf_uid}@apache.org"
         subject = f"Re: {original_subject}"
-        body = [f"{vote.lower()} ({self.__asf_uid}) {fullname}"]
+        body = [f"{vote.lower()} ({self._asf_uid}) {fullname}"]
         if comment:
             body.append(f"{comment}")
             # Only include the signature if there is a comment
-            body.append(f"-- \n{fullname} ({self.__asf_uid})")
+            body.append(f"-- \n{fullname} ({self._asf_uid})")
         body_text = "\n\n".join(body)
         in_reply_to = vote_thread_mid
 
         task = sql.Task(
             status=sql.TaskStatus.QUEUED,
             task_type=sql.TaskType.MESSAGE_SEND,
-            task_args=message.Send(
+            task_args=message.Send.model_construct(
                 email_sender=email_sender,
                 email_recipient=email_recipient,
                 subject=subject,
                 body=body_text,
                 in_reply_to=in_reply_to,
             ).model_dump(),
-            asf_uid=self.__asf_uid,
+            asf_uid=self._asf_uid,
             project_name=release.project.name,
             version_name=release.version,
         )
-        self.__data.add(task)
-        await self.__data.flush()
-        await self.__data.commit()
+        self._data.add(task)
+        await self._data.flush()
+        await self._data.commit()
 
         return email_recipient, ""
 
@@ -140,14 +143,14 @@ class CommitteeParticipant(FoundationCommitter):
         permitted_recipients: list[str] | None = None,
     ) -> sql.Task:
         if release is None:
-            release = await self.__data.release(
+            release = await self._data.release(
                 project_name=project_name,
                 version=version_name,
                 _project=True,
                 _committee=True,
             ).demand(storage.AccessError("Release not found"))
         if permitted_recipients is None:
-            permitted_recipients = util.permitted_voting_recipients(asf_uid, self.__committee_name)
+            permitted_recipients = util.permitted_voting_recipients(asf_uid, self._committee_name)
         if email_to not in permitted_recipients:
             # This will be checked again by tasks/vote.py for extra safety
             log.info(f"Invalid mailing list choice: {email_to} not in {permitted_recipients}")
@@ -185,8 +188,8 @@ class CommitteeParticipant(FoundationCommitter):
             project_name=project_name,
             version_name=version_name,
         )
-        self.__data.add(task)
-        await self.__data.commit()
+        self._data.add(task)
+        await self._data.commit()
 
         # TODO: We should log all outgoing email and the session so that users can confirm
         # And can be warned if there was a failure
@@ -195,6 +198,8 @@ class CommitteeParticipant(FoundationCommitter):
 
 
 class CommitteeMember(CommitteeParticipant):
+    __slots__ = ("__write_as",)
+
     def __init__(
         self,
         write: storage.Write,
@@ -203,14 +208,7 @@ class CommitteeMember(CommitteeParticipant):
         committee_name: str,
     ):
         super().__init__(write, write_as, data, committee_name)
-        self.__write = write
         self.__write_as = write_as
-        self.__data = data
-        asf_uid = write.authorisation.asf_uid
-        if asf_uid is None:
-            raise storage.AccessError("No ASF UID")
-        self.__asf_uid = asf_uid
-        self.__committee_name = committee_name
 
     async def resolve(
         self,
@@ -220,7 +218,7 @@ class CommitteeMember(CommitteeParticipant):
         asf_fullname: str,
         resolution_body: str,
     ) -> tuple[sql.Release, int | None, str, str | None]:
-        release = await self.__data.release(
+        release = await self._data.release(
             name=sql.release_name(project_name, version_name),
             phase=sql.ReleasePhase.RELEASE_CANDIDATE,
             _project=True,
@@ -259,23 +257,23 @@ class CommitteeMember(CommitteeParticipant):
         vote_result: Literal["passed", "failed"],
     ) -> str:
         # Attach the existing release to the session
-        release = await self.__data.merge(release)
+        release = await self._data.merge(release)
 
         if vote_result == "passed":
             release.phase = sql.ReleasePhase.RELEASE_PREVIEW
-            await self.__data.commit()
-            await self.__data.refresh(release)
+            await self._data.commit()
+            await self._data.refresh(release)
             success_message = "Vote marked as passed"
 
             description = "Create a preview revision from the last candidate draft"
             async with self.__write_as.revision.create_and_manage(
-                project_name, release.version, self.__asf_uid, description=description
+                project_name, release.version, self._asf_uid, description=description
             ) as _creating:
                 pass
         else:
             release.phase = sql.ReleasePhase.RELEASE_CANDIDATE_DRAFT
-            await self.__data.commit()
-            await self.__data.refresh(release)
+            await self._data.commit()
+            await self._data.refresh(release)
             success_message = "Vote marked as failed"
 
         return success_message
@@ -291,7 +289,7 @@ class CommitteeMember(CommitteeParticipant):
         resolution_body: str,
     ) -> tuple[sql.Release, int | None, str, str | None]:
         # Attach the existing release to the session
-        release = await self.__data.merge(release)
+        release = await self._data.merge(release)
         # Update the release phase based on vote result
         extra_destination = None
         if (voting_round == 1) and (vote_result == "passed"):
@@ -301,7 +299,12 @@ class CommitteeMember(CommitteeParticipant):
             # Then we automatically start the Incubator PMC vote
             # TODO: Note on the resolve vote page that resolving the Project PPMC vote starts the Incubator PMC vote
             task_mid = interaction.task_mid_get(latest_vote_task)
-            archive_url = await self.__write_as.cache.get_message_archive_url(task_mid)
+            # The archive URL fetch and the vote body construction are
+            # independent, so overlap them
+            archive_url, body_data = await asyncio.gather(
+                self.__write_as.cache.get_message_archive_url(task_mid),
+                construct.start_vote_default(release.project.name),
+            )
             if archive_url is None:
                 raise ValueError("No archive URL found for podling vote")
             thread_id = archive_url.split("/")[-1]
@@ -319,24 +322,24 @@ class CommitteeMember(CommitteeParticipant):
                 project_name=release.project.name,
                 version_name=release.version,
                 selected_revision_number=revision_number,
-                asf_uid=self.__asf_uid,
+                asf_uid=self._asf_uid,
                 asf_fullname=asf_fullname,
                 vote_duration_choice=latest_vote_task.task_args["vote_duration"],
                 subject_data=f"[VOTE] Release {release.project.display_name} {release.version}",
-                body_data=await construct.start_vote_default(release.project.name),
+                body_data=body_data,
                 release=release,
                 promote=False,
             )
             success_message = "Project PPMC vote marked as passed, and Incubator PMC vote automatically started"
         elif vote_result == "passed":
             release.phase = sql.ReleasePhase.RELEASE_PREVIEW
-            await self.__data.commit()
-            await self.__data.refresh(release)
+            await self._data.commit()
+            await self._data.refresh(release)
             success_message = "Vote marked as passed"
 
             description = "Create a preview revision from the last candidate draft"
             async with self.__write_as.revision.create_and_manage(
-                project_name, release.version, self.__asf_uid, description=description
+                project_name, release.version, self._asf_uid, description=description
             ) as _creating:
                 pass
             if (voting_round == 2) and (release.podling_thread_id is not None):
@@ -345,16 +348,17 @@ class CommitteeMember(CommitteeParticipant):
                 )
                 extra_destination = (round_one_email_address, round_one_message_id)
         else:
+            # No separate commit here: the phase change is committed together
+            # with the resolution tasks in send_resolution, so a failure to
+            # queue them also rolls the phase back
             release.phase = sql.ReleasePhase.RELEASE_CANDIDATE_DRAFT
-            await self.__data.commit()
-            await self.__data.refresh(release)
             success_message = "Vote marked as failed"
 
         error_message = await self.send_resolution(
             release,
             vote_result,
             resolution_body,
-            self.__asf_uid,
+            self._asf_uid,
             asf_fullname,
             latest_vote_task,
             extra_destination=extra_destination,
@@ -389,40 +393,48 @@ class CommitteeMember(CommitteeParticipant):
         body = f"{body}\n\n{signature}"
         in_reply_to = vote_thread_mid
 
-        task = sql.Task(
-            status=sql.TaskStatus.QUEUED,
-            task_type=sql.TaskType.MESSAGE_SEND,
-            task_args=message.Send(
+        send_args = message.Send.model_construct(
+            email_sender=email_sender,
+            email_recipient=email_recipient,
+            subject=subject,
+            body=body,
+            in_reply_to=in_reply_to,
+        ).model_dump()
+        if extra_destination is None:
+            self._data.add(
+                sql.Task(
+                    status=sql.TaskStatus.QUEUED,
+                    task_type=sql.TaskType.MESSAGE_SEND,
+                    task_args=send_args,
+                    asf_uid=asf_uid,
+                    project_name=release.project.name,
+                    version_name=release.version,
+                )
+            )
+        else:
+            extra_send_args = message.Send.model_construct(
                 email_sender=email_sender,
-                email_recipient=email_recipient,
+                email_recipient=extra_destination[0],
                 subject=subject,
                 body=body,
-                in_reply_to=in_reply_to,
-            ).model_dump(),
-            asf_uid=asf_uid,
-            project_name=release.project.name,
-            version_name=release.version,
-        )
-        tasks = [task]
-        if extra_destination is not None:
-            task = sql.Task(
-                status=sql.TaskStatus.QUEUED,
-                task_type=sql.TaskType.MESSAGE_SEND,
-                task_args=message.Send(
-                    email_sender=email_sender,
-                    email_recipient=extra_destination[0],
-                    subject=subject,
-                    body=body,
-                    in_reply_to=extra_destination[1],
-                ).model_dump(),
-                asf_uid=asf_uid,
-                project_name=release.project.name,
-                version_name=release.version,
+                in_reply_to=extra_destination[1],
+            ).model_dump()
+            # One multi-row INSERT for both destinations
+            # The added column has a model level default only, so set it here
+            common = {
+                "status": sql.TaskStatus.QUEUED,
+                "task_type": sql.TaskType.MESSAGE_SEND,
+                "asf_uid": asf_uid,
+                "added": datetime.datetime.now(datetime.UTC),
+                "project_name": release.project.name,
+                "version_name": release.version,
+            }
+            await self._data.execute(
+                sqlalchemy.insert(sql.Task),
+                [{**common, "task_args": send_args}, {**common, "task_args": extra_send_args}],
             )
-            tasks.append(task)
-        self.__data.add_all(tasks)
-        await self.__data.flush()
-        await self.__data.commit()
+        # The commit flushes, so the phase change and tasks go out in one transaction
+        await self._data.commit()
         return None
 
     # def __committee_member_or_admin(self, committee: sql.Committee, asf_uid: str) -> None:
@@ -15,8 +15,11 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import asyncio
+import re
 import time
 from collections.abc import Generator
+from typing import Final
 
 import atr.db as db
 import atr.log as log
@@ -24,47 +27,80 @@ import atr.models as models
 import atr.models.sql as sql
 import atr.util as util
 
+# LDAP mappings change on the order of hours, so a few minutes of caching is safe
+_EMAIL_TO_UID_TTL_SECONDS: Final[int] = 300
+_email_to_uid_cache: tuple[float, dict[str, str]] | None = None
+_email_to_uid_lock: Final[asyncio.Lock] = asyncio.Lock()
+
+# These are hoisted once so that _vote_castings makes a single pass per line
+# Quoted email markers, and the indicators used by the [VOTE] OP to say how to vote
+_VOTE_BREAK_PREFIXES: Final[tuple[str, ...]] = ("From: ", "________")
+_VOTE_CONTINUE_SUBSTRINGS: Final[tuple[str, ...]] = ("[ ] +1", "[ ] -1", "binding +1 votes", "binding -1 votes")
+_VOTE_PLUS_ONE_PATTERN: Final[re.Pattern[str]] = re.compile(r"(?:^| )\+1")
+_VOTE_MINUS_ONE_PATTERN: Final[re.Pattern[str]] = re.compile(r"(?:^| )-1")
+# We must be more stringent about zero votes, can't just check for "0" in line
+_VOTE_ZERO_PATTERN: Final[re.Pattern[str]] = re.compile(r"[+-]?0(?: |$)")
+
+_STATUS_LOWER: Final[dict[models.tabulate.VoteStatus, str]] = {
+    status: status.value.lower() for status in models.tabulate.VoteStatus
+}
+_VOTE_SYMBOL: Final[dict[models.tabulate.Vote, str]] = {
+    models.tabulate.Vote.YES: "+1",
+    models.tabulate.Vote.NO: "-1",
+    models.tabulate.Vote.ABSTAIN: "0",
+    models.tabulate.Vote.UNKNOWN: "?",
+}
+
+_SUMMARY_STATUS_PREFIX: Final[dict[models.tabulate.VoteStatus, str]] = {
+    models.tabulate.VoteStatus.BINDING: "binding",
+    models.tabulate.VoteStatus.COMMITTER: "non_binding",
+    models.tabulate.VoteStatus.CONTRIBUTOR: "non_binding",
+    models.tabulate.VoteStatus.UNKNOWN: "unknown",
+}
+_SUMMARY_VOTE_SUFFIX: Final[dict[models.tabulate.Vote, str]] = {
+    models.tabulate.Vote.YES: "_votes_yes",
+    models.tabulate.Vote.NO: "_votes_no",
+    models.tabulate.Vote.ABSTAIN: "_votes_abstain",
+}
+
 
 async def votes(
     committee: sql.Committee | None, thread_id: str
-) -> tuple[int | None, dict[str, models.tabulate.VoteEmail]]:
-    """Tabulate votes."""
-    start = time.perf_counter_ns()
-    email_to_uid = await util.email_to_uid_map()
-    end = time.perf_counter_ns()
-    log.info(f"LDAP search took {(end - start) / 1000000} ms")
-    log.info(f"Email addresses from LDAP: {len(email_to_uid)}")
+) -> tuple[int | None, dict[str, models.tabulate.VoteEmail], dict[str, int]]:
+    """Tabulate votes, maintaining the summary counts as messages arrive."""
+    email_to_uid = await _email_to_uid_cached()
 
     start = time.perf_counter_ns()
-    tabulated_votes = {}
+    tabulated_votes: dict[str, models.tabulate.VoteEmail] = {}
+    summary = _vote_summary_zero()
     start_unixtime = None
-    async for _mid, msg in util.thread_messages(thread_id):
-        from_raw = msg.get("from_raw", "")
-        ok, from_email_lower, asf_uid = _vote_identity(from_raw, email_to_uid)
+    # Membership is checked per message, so snapshot it as sets up front
+    committee_members = frozenset(committee.committee_members) if (committee is not None) else None
+    committers = frozenset(committee.committers) if (committee is not None) else None
+    # Filtering on thread metadata avoids downloading the [RESULT] bodies at all
+    async for _mid, msg in util.thread_messages(thread_id, stop_subject="[RESULT]"):
+        # Cheap gates come first, so discarded messages do no identity work
+        if (start_unixtime is None) and msg.epoch:
+            start_unixtime = msg.epoch
+
+        if "[RESULT]" in msg.subject:
+            break
+
+        body = msg.body
+        if not body:
+            continue
+
+        ok, from_email_lower, asf_uid = _vote_identity(msg.from_raw, email_to_uid)
         if not ok:
             continue
 
         if asf_uid is not None:
             asf_uid_or_email = asf_uid
-            list_raw = msg.get("list_raw", "")
-            status = await _vote_status(asf_uid, list_raw, committee)
+            status = _vote_status(asf_uid, committee_members, committers)
         else:
             asf_uid_or_email = from_email_lower
             status = models.tabulate.VoteStatus.UNKNOWN
 
-        if start_unixtime is None:
-            epoch = msg.get("epoch", "")
-            if epoch:
-                start_unixtime = int(epoch)
-
-        subject = msg.get("subject", "")
-        if "[RESULT]" in subject:
-            break
-
-        body = msg.get("body", "")
-        if not body:
-            continue
-
         castings = _vote_castings(body)
         if not castings:
             continue
@@ -75,31 +111,33 @@ async def votes(
             vote_cast = models.tabulate.Vote.UNKNOWN
         quotation = " // ".join([c[1] for c in castings])
 
-        vote_email = models.tabulate.VoteEmail(
+        # Every field here is already of the declared type, so skip validation
+        vote_email = models.tabulate.VoteEmail.model_construct(
             asf_uid_or_email=asf_uid_or_email,
             from_email=from_email_lower,
             status=status,
-            asf_eid=msg.get("mid", ""),
-            iso_datetime=msg.get("date", ""),
+            asf_eid=msg.mid,
+            iso_datetime=msg.date,
             vote=vote_cast,
             quotation=quotation,
             updated=asf_uid_or_email in tabulated_votes,
         )
-        tabulated_votes[asf_uid_or_email] = vote_email
+        _vote_record(tabulated_votes, summary, vote_email)
     end = time.perf_counter_ns()
     log.info(f"Tabulated votes: {len(tabulated_votes)}")
     log.info(f"Tabulation took {(end - start) / 1000000} ms")
 
-    return start_unixtime, tabulated_votes
+    return start_unixtime, tabulated_votes, summary
 
 
-async def vote_committee(thread_id: str, release: sql.Release) -> sql.Committee | None:
+async def vote_committee(
+    thread_id: str, release: sql.Release, caller_data: db.Session | None = None
+) -> sql.Committee | None:
     committee = release.project.committee
     if util.is_dev_environment():
         async for _mid, msg in util.thread_messages(thread_id):
-            list_raw = msg.get("list_raw", "")
-            committee_label = list_raw.split(".apache.org", 1)[0].split(".", 1)[-1]
-            async with db.session() as data:
+            committee_label = util.list_committee_label(msg.list_raw)
+            async with db.ensure_session(caller_data) as data:
                 committee = await data.committee(name=committee_label).get()
             break
     return committee
@@ -108,9 +146,10 @@ async def vote_committee(thread_id: str, release: sql.Release) -> sql.Committee
 async def vote_details(
     committee: sql.Committee | None, thread_id: str, release: sql.Release
 ) -> models.tabulate.VoteDetails:
-    start_unixtime, tabulated_votes = await votes(committee, thread_id)
-    summary = vote_summary(tabulated_votes)
-    passed, outcome = vote_outcome(release, start_unixtime, tabulated_votes)
+    start_unixtime, tabulated_votes, summary = await votes(committee, thread_id)
+    passed, outcome = _vote_outcome_from_counts(
+        release, start_unixtime, summary["binding_votes_yes"], summary["binding_votes_no"]
+    )
     return models.tabulate.VoteDetails(
         start_unixtime=start_unixtime,
         votes=tabulated_votes,
@@ -123,29 +162,17 @@ async def vote_details(
 def vote_outcome(
     release: sql.Release, start_unixtime: int | None, tabulated_votes: dict[str, models.tabulate.VoteEmail]
 ) -> tuple[bool, str]:
-    now = int(time.time())
-    duration_hours = 0
-    if start_unixtime is not None:
-        duration_hours = (now - start_unixtime) / 3600
-
-    min_duration_hours = 72
-    if release.project.release_policy is not None:
-        min_duration_hours = release.project.release_policy.min_hours or None
-    duration_hours_remaining = None
-    if min_duration_hours is not None:
-        duration_hours_remaining = min_duration_hours - duration_hours
-
     binding_plus_one = 0
     binding_minus_one = 0
     for vote_email in tabulated_votes.values():
-        if vote_email.status != models.tabulate.VoteStatus.BINDING:
+        if vote_email.status is not models.tabulate.VoteStatus.BINDING:
             continue
-        if vote_email.vote == models.tabulate.Vote.YES:
+        if vote_email.vote is models.tabulate.Vote.YES:
             binding_plus_one += 1
-        elif vote_email.vote == models.tabulate.Vote.NO:
+        elif vote_email.vote is models.tabulate.Vote.NO:
             binding_minus_one += 1
 
-    return _vote_outcome_format(duration_hours_remaining, binding_plus_one, binding_minus_one)
+    return _vote_outcome_from_counts(release, start_unixtime, binding_plus_one, binding_minus_one)
 
 
 def vote_resolution(
@@ -168,69 +195,56 @@ def vote_resolution(
 
 
 def vote_summary(tabulated_votes: dict[str, models.tabulate.VoteEmail]) -> dict[str, int]:
-    result = {
-        "binding_votes": 0,
-        "binding_votes_yes": 0,
-        "binding_votes_no": 0,
-        "binding_votes_abstain": 0,
-        "non_binding_votes": 0,
-        "non_binding_votes_yes": 0,
-        "non_binding_votes_no": 0,
-        "non_binding_votes_abstain": 0,
-        "unknown_votes": 0,
-        "unknown_votes_yes": 0,
-        "unknown_votes_no": 0,
-        "unknown_votes_abstain": 0,
-    }
-
+    result = _vote_summary_zero()
     for vote_email in tabulated_votes.values():
-        if vote_email.status == models.tabulate.VoteStatus.BINDING:
-            result["binding_votes"] += 1
-            result["binding_votes_yes"] += 1 if (vote_email.vote.value == "Yes") else 0
-            result["binding_votes_no"] += 1 if (vote_email.vote.value == "No") else 0
-            result["binding_votes_abstain"] += 1 if (vote_email.vote.value == "?") else 0
-        elif vote_email.status in {models.tabulate.VoteStatus.COMMITTER, models.tabulate.VoteStatus.CONTRIBUTOR}:
-            result["non_binding_votes"] += 1
-            result["non_binding_votes_yes"] += 1 if (vote_email.vote.value == "Yes") else 0
-            result["non_binding_votes_no"] += 1 if (vote_email.vote.value == "No") else 0
-            result["non_binding_votes_abstain"] += 1 if (vote_email.vote.value == "?") else 0
-        else:
-            result["unknown_votes"] += 1
-            result["unknown_votes_yes"] += 1 if (vote_email.vote.value == "Yes") else 0
-            result["unknown_votes_no"] += 1 if (vote_email.vote.value == "No") else 0
-            result["unknown_votes_abstain"] += 1 if (vote_email.vote.value == "?") else 0
-
+        _vote_summary_add(result, vote_email, 1)
     return result
 
 
+async def _email_to_uid_cached() -> dict[str, str]:
+    global _email_to_uid_cache
+    cached = _email_to_uid_cache
+    if (cached is not None) and ((time.monotonic() - cached[0]) < _EMAIL_TO_UID_TTL_SECONDS):
+        return cached[1]
+    async with _email_to_uid_lock:
+        # Concurrent tabulations coalesce into one LDAP round-trip
+        cached = _email_to_uid_cache
+        if (cached is not None) and ((time.monotonic() - cached[0]) < _EMAIL_TO_UID_TTL_SECONDS):
+            return cached[1]
+        start = time.perf_counter_ns()
+        email_to_uid = await util.email_to_uid_map()
+        end = time.perf_counter_ns()
+        log.info(f"LDAP search took {(end - start) / 1000000} ms")
+        log.info(f"Email addresses from LDAP: {len(email_to_uid)}")
+        _email_to_uid_cache = (time.monotonic(), email_to_uid)
+        return email_to_uid
+
+
 def _vote_break(line: str) -> bool:
-    if line == "-- ":
-        # Start of a signature
-        return True
-    if line.startswith("On ") and (line[6:8] == ", "):
-        # Start of a quoted email
-        return True
-    if line.startswith("From: "):
-        # Start of a quoted email
+    # A signature start, or a "From: " or "________" quoted email marker
+    if (line == "-- ") or line.startswith(_VOTE_BREAK_PREFIXES):
         return True
-    if line.startswith("________"):
-        # This is sometimes used as an "On " style quotation marker
-        return True
-    return False
+    # An "On ..., " quoted email marker
+    return line.startswith("On ") and (line[6:8] == ", ")
 
 
-def _vote_castings(body: str) -> list[tuple[models.tabulate.Vote, str]]:
+def _vote_castings(body: str, max_castings: int = 2) -> list[tuple[models.tabulate.Vote, str]]:
+    # Two castings are enough to distinguish a single vote from a confusing one,
+    # so by default stop scanning the body there
     castings = []
-    for line in body.split("\n"):
+    # Unlike split("\n"), splitlines strips the "\r" from CRLF emails,
+    # which otherwise defeats the exact signature and zero vote checks
+    for line in body.splitlines():
+        if len(castings) >= max_castings:
+            break
         if _vote_continue(line):
             continue
         if _vote_break(line):
             break
 
-        plus_one = line.startswith("+1") or " +1" in line
-        minus_one = line.startswith("-1") or " -1" in line
-        # We must be more stringent about zero votes, can't just check for "0" in line
-        zero = line in {"0", "-0", "+0"} or line.startswith("0 ") or line.startswith("+0 ") or line.startswith("-0 ")
+        plus_one = _VOTE_PLUS_ONE_PATTERN.search(line) is not None
+        minus_one = _VOTE_MINUS_ONE_PATTERN.search(line) is not None
+        zero = _VOTE_ZERO_PATTERN.match(line) is not None
         if (plus_one and minus_one) or (plus_one and zero) or (minus_one and zero):
             # Confusing result
             continue
@@ -244,20 +258,10 @@ def _vote_castings(body: str) -> list[tuple[models.tabulate.Vote, str]]:
 
 
 def _vote_continue(line: str) -> bool:
-    explanation_indicators = [
-        "[ ] +1",
-        "[ ] -1",
-        "binding +1 votes",
-        "binding -1 votes",
-    ]
-    if any((indicator in line) for indicator in explanation_indicators):
-        # These indicators are used by the [VOTE] OP to indicate how to vote
-        return True
-
+    # Used to quote other emails
     if line.startswith(">"):
-        # Used to quote other emails
         return True
-    return False
+    return any((indicator in line) for indicator in _VOTE_CONTINUE_SUBSTRINGS)
 
 
 def _vote_identity(from_raw: str, email_to_uid: dict[str, str]) -> tuple[bool, str, str | None]:
@@ -273,6 +277,24 @@ def _vote_identity(from_raw: str, email_to_uid: dict[str, str]) -> tuple[bool, s
     return True, from_email_lower, asf_uid
 
 
+def _vote_outcome_from_counts(
+    release: sql.Release, start_unixtime: int | None, binding_plus_one: int, binding_minus_one: int
+) -> tuple[bool, str]:
+    now = int(time.time())
+    duration_hours = 0
+    if start_unixtime is not None:
+        duration_hours = (now - start_unixtime) / 3600
+
+    min_duration_hours = 72
+    if release.project.release_policy is not None:
+        min_duration_hours = release.project.release_policy.min_hours or None
+    duration_hours_remaining = None
+    if min_duration_hours is not None:
+        duration_hours_remaining = min_duration_hours - duration_hours
+
+    return _vote_outcome_format(duration_hours_remaining, binding_plus_one, binding_minus_one)
+
+
 def _vote_outcome_format(
     duration_hours_remaining: float | int | None, binding_plus_one: int, binding_minus_one: int
 ) -> tuple[bool, str]:
@@ -295,6 +317,19 @@ def _vote_outcome_format(
     return True, msg
 
 
+def _vote_record(
+    tabulated_votes: dict[str, models.tabulate.VoteEmail],
+    summary: dict[str, int],
+    vote_email: models.tabulate.VoteEmail,
+) -> None:
+    previous = tabulated_votes.get(vote_email.asf_uid_or_email)
+    if previous is not None:
+        # An updated vote replaces the earlier one, so retract its counts
+        _vote_summary_add(summary, previous, -1)
+    _vote_summary_add(summary, vote_email, 1)
+    tabulated_votes[vote_email.asf_uid_or_email] = vote_email
+
+
 def _vote_resolution_body(
     committee: sql.Committee,
     release: sql.Release,
@@ -360,7 +395,7 @@ def _vote_resolution_body_votes(
 def _vote_resolution_votes(
     tabulated_votes: dict[str, models.tabulate.VoteEmail], statuses: set[models.tabulate.VoteStatus]
 ) -> Generator[str]:
-    header: str | None = f"The {' and '.join(status.value.lower() for status in statuses)} votes were cast as follows:"
+    header: str | None = f"The {' and '.join(_STATUS_LOWER[status] for status in statuses)} votes were cast as follows:"
     for vote_email in tabulated_votes.values():
         if vote_email.status not in statuses:
             continue
@@ -368,17 +403,9 @@ def _vote_resolution_votes(
             yield header
             yield ""
             header = None
-        match vote_email.vote:
-            case models.tabulate.Vote.YES:
-                symbol = "+1"
-            case models.tabulate.Vote.NO:
-                symbol = "-1"
-            case models.tabulate.Vote.ABSTAIN:
-                symbol = "0"
-            case models.tabulate.Vote.UNKNOWN:
-                symbol = "?"
+        symbol = _VOTE_SYMBOL[vote_email.vote]
         user_info = vote_email.asf_uid_or_email
-        status = vote_email.status.value.lower()
+        status = _STATUS_LOWER[vote_email.status]
         if vote_email.updated:
             status += ", updated"
         yield f"{symbol} {user_info} ({status})"
@@ -386,18 +413,38 @@ def _vote_resolution_votes(
         yield ""
 
 
-async def _vote_status(asf_uid: str, list_raw: str, committee: sql.Committee | None) -> models.tabulate.VoteStatus:
-    status = models.tabulate.VoteStatus.UNKNOWN
+def _vote_status(
+    asf_uid: str, committee_members: frozenset[str] | None, committers: frozenset[str] | None
+) -> models.tabulate.VoteStatus:
+    if (committee_members is None) or (committers is None):
+        return models.tabulate.VoteStatus.UNKNOWN
+    if asf_uid in committee_members:
+        return models.tabulate.VoteStatus.BINDING
+    if asf_uid in committers:
+        return models.tabulate.VoteStatus.COMMITTER
+    return models.tabulate.VoteStatus.CONTRIBUTOR
 
-    if util.is_dev_environment():
-        committee_label = list_raw.split(".apache.org", 1)[0].split(".", 1)[-1]
-        async with db.session() as data:
-            committee = await data.committee(name=committee_label).get()
-    if committee is not None:
-        if asf_uid in committee.committee_members:
-            status = models.tabulate.VoteStatus.BINDING
-        elif asf_uid in committee.committers:
-            status = models.tabulate.VoteStatus.COMMITTER
-        else:
-            status = models.tabulate.VoteStatus.CONTRIBUTOR
-    return status
+
+def _vote_summary_add(summary: dict[str, int], vote_email: models.tabulate.VoteEmail, delta: int) -> None:
+    prefix = _SUMMARY_STATUS_PREFIX[vote_email.status]
+    summary[prefix + "_votes"] += delta
+    suffix = _SUMMARY_VOTE_SUFFIX.get(vote_email.vote)
+    if suffix is not None:
+        summary[prefix + suffix] += delta
+
+
+def _vote_summary_zero() -> dict[str, int]:
+    return {
+        "binding_votes": 0,
+        "binding_votes_yes": 0,
+        "binding_votes_no": 0,
+        "binding_votes_abstain": 0,
+        "non_binding_votes": 0,
+        "non_binding_votes_yes": 0,
+        "non_binding_votes_no": 0,
+        "non_binding_votes_abstain": 0,
+        "unknown_votes": 0,
+        "unknown_votes_yes": 0,
+        "unknown_votes_no": 0,
+        "unknown_votes_abstain": 0,
+    }
@@ -18,11 +18,19 @@
 """user.py"""
 
 import functools
+import time
+from typing import Final
 
 import atr.config as config
 import atr.db as db
 import atr.models.sql as sql
 
+# Projects are queried on nearly every authenticated request, so cache briefly
+_PROJECTS_TTL_SECONDS: Final[int] = 60
+_PROJECTS_MAX_ENTRIES: Final[int] = 50_000
+_projects_cache: dict[tuple[int, str, bool, bool], tuple[list[sql.Project], float]] = {}
+_projects_epoch: int = 0
+
 
 async def candidate_drafts(uid: str, user_projects: list[sql.Project] | None = None) -> list[sql.Release]:
     # Must be imported here, to avoid a circular import
@@ -67,6 +75,26 @@ def is_committer(committee: sql.Committee | None, uid: str) -> bool:
 
 
 async def projects(uid: str, committee_only: bool = False, super_project: bool = False) -> list[sql.Project]:
+    key = (_projects_epoch, uid, committee_only, super_project)
+    cached = _projects_cache.get(key)
+    if (cached is not None) and ((time.time() - cached[1]) < _PROJECTS_TTL_SECONDS):
+        # Copy so that callers sorting in place do not disturb the cache
+        return list(cached[0])
+    user_projects = await _projects_query(uid, committee_only, super_project)
+    if len(_projects_cache) >= _PROJECTS_MAX_ENTRIES:
+        _projects_cache.clear()
+    _projects_cache[key] = (user_projects, time.time())
+    return list(user_projects)
+
+
+def projects_cache_invalidate() -> None:
+    """Invalidate cached project memberships after committee data changes."""
+    global _projects_epoch
+    _projects_epoch += 1
+    _projects_cache.clear()
+
+
+async def _projects_query(uid: str, committee_only: bool, super_project: bool) -> list[sql.Project]:
     user_projects: list[sql.Project] = []
     async with db.session() as data:
         # Must have releases, because this is used in candidate_drafts
@@ -58,6 +58,8 @@ T = TypeVar("T")
 
 USER_TESTS_ADDRESS: Final[str] = "user-tests@tooling.apache.org"
 
+_LIST_LABEL_PATTERN: Final[re.Pattern[str]] = re.compile(r"\.([^.]+)\.apache\.org")
+
 
 class SshFingerprintError(ValueError):
     pass
@@ -77,6 +79,43 @@ class FetchError(RuntimeError):
     pass
 
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class ThreadMessage:
+    """The fields of a mailing list message that ATR reads."""
+
+    id: str = ""
+    mid: str = ""
+    from_raw: str = ""
+    list_raw: str = ""
+    subject: str = ""
+    date: str = ""
+    body: str = ""
+    forum: str = ""
+    message_id: str = ""
+    epoch: int = 0
+
+    @classmethod
+    def from_json(cls, msg_json: dict[str, Any]) -> "ThreadMessage":
+        def get_str(key: str) -> str:
+            value = msg_json.get(key)
+            if value is None:
+                return ""
+            return value if isinstance(value, str) else str(value)
+
+        return cls(
+            id=get_str("id"),
+            mid=get_str("mid"),
+            from_raw=get_str("from_raw"),
+            list_raw=get_str("list_raw"),
+            subject=get_str("subject"),
+            date=get_str("date"),
+            body=get_str("body"),
+            forum=get_str("forum"),
+            message_id=get_str("message-id"),
+            epoch=_thread_message_epoch(msg_json),
+        )
+
+
 async def archive_listing(file_path: pathlib.Path) -> list[str] | None:
     """Attempt to list contents of supported archive files."""
     if not await aiofiles.os.path.isfile(file_path):
@@ -281,15 +320,15 @@ def email_from_uid(uid: str) -> str | None:
 
 
 async def email_mid_from_thread_id(thread_id: str) -> tuple[str, str]:
-    async for _thread_id, msg_json in thread_messages(thread_id):
-        # The .get("to", "") value may be redacted, e.g. "us...@tooling.apache.org"
-        # Therefore use .get("forum", "")
-        email_to = msg_json.get("forum", "")
-        if email_to is None:
+    async for _thread_id, msg in thread_messages(thread_id):
+        # The "to" value may be redacted, e.g. "us...@tooling.apache.org"
+        # Therefore use the forum value
+        email_to = msg.forum
+        if not email_to:
             raise RuntimeError(f"Cannot find email address for {thread_id}")
         # This is delimited by angle brackets, e.g. "<1234567890@apache.org>"
-        message_id = msg_json.get("message-id", "")
-        if message_id is None:
+        message_id = msg.message_id
+        if not message_id:
             raise RuntimeError(f"Cannot find message ID for {thread_id}")
         return email_to, message_id
     raise RuntimeError(f"Cannot find any messages in {thread_id}")
@@ -460,13 +499,17 @@ def get_unfinished_dir() -> pathlib.Path:
     return pathlib.Path(config.get().UNFINISHED_STORAGE_DIR)
 
 
-async def get_urls_as_completed(urls: Sequence[str]) -> AsyncGenerator[tuple[str, int | str | None, bytes]]:
+async def get_urls_as_completed(
+    urls: Sequence[str], concurrency: int = 16
+) -> AsyncGenerator[tuple[str, int | str | None, bytes]]:
     """GET a list of URLs in parallel and yield (url, status, content_bytes) as they become available."""
+    # Bound the parallelism so that large batches do not open one connection per URL
+    semaphore = asyncio.Semaphore(concurrency)
     async with aiohttp.ClientSession() as session:
 
         async def _fetch(one_url: str) -> tuple[str, int | str | None, bytes]:
             try:
-                async with session.get(one_url) as resp:
+                async with semaphore, session.get(one_url) as resp:
                     try:
                         resp.raise_for_status()
                         return (str(resp.url), resp.status, await resp.read())
@@ -557,6 +600,14 @@ def key_ssh_fingerprint_core(ssh_key_string: str) -> str:
     raise ValueError("Invalid SSH key format")
 
 
+def list_committee_label(list_raw: str) -> str:
+    """Extract the committee label from a list_raw value such as "<dev.tooling.apache.org>"."""
+    if m := _LIST_LABEL_PATTERN.search(list_raw):
+        return m.group(1)
+    # Lists such as "dev.apache.org" have no label before the domain
+    return list_raw.split(".apache.org", 1)[0].split(".", 1)[-1]
+
+
 async def number_of_release_files(release: sql.Release) -> int:
     """Return the number of files in a release."""
     if (path := release_directory_revision(release)) is None:
@@ -840,8 +891,13 @@ async def task_archive_url(task_mid: str) -> str | None:
 
 async def thread_messages(
     thread_id: str,
-) -> AsyncGenerator[tuple[str, dict[str, Any]]]:
-    """Iterate over mailing list thread messages in chronological order."""
+    stop_subject: str | None = None,
+) -> AsyncGenerator[tuple[str, ThreadMessage]]:
+    """Iterate over mailing list thread messages in chronological order.
+
+    When stop_subject is given, messages from the first message whose subject
+    contains it onwards are not fetched or yielded.
+    """
 
     thread_url = f"https://lists.apache.org/api/thread.lua?id={thread_id}"
 
@@ -853,20 +909,14 @@ async def thread_messages(
     except Exception as exc:
         raise FetchError(f"Failed fetching thread metadata for {thread_id}: {exc}") from exc
 
-    message_ids: set[str] = set()
-
-    if isinstance(thread_data, dict):
-        for email_entry in thread_data.get("emails", []):
-            if isinstance(email_entry, dict) and (mid := email_entry.get("id")):
-                message_ids.add(str(mid))
-        _thread_messages_walk(thread_data.get("thread"), message_ids)
+    message_ids = _thread_messages_ids(thread_data, stop_subject)
 
     if not message_ids:
         return
 
     email_urls = [f"https://lists.apache.org/api/email.lua?id={mid}" for mid in message_ids]
 
-    messages: list[dict[str, Any]] = []
+    messages: list[ThreadMessage] = []
 
     async for url, status, content in get_urls_as_completed(email_urls):
         if status != 200 or not content:
@@ -874,15 +924,14 @@ async def thread_messages(
             continue
         try:
             msg_json = json.loads(content.decode())
-            messages.append(msg_json)
+            messages.append(ThreadMessage.from_json(msg_json))
         except Exception as exc:
             log.warning("Failed to parse email JSON from %s: %s", url, exc)
 
-    messages.sort(key=lambda m: m.get("epoch", 0))
+    messages.sort(key=lambda m: m.epoch)
 
-    for msg_json in messages:
-        msg_id = str(msg_json.get("id", ""))
-        yield msg_id, msg_json
+    for msg in messages:
+        yield msg.id, msg
 
 
 def unwrap[T](value: T | None, error_message: str = "unexpected None when unwrapping value") -> T:
@@ -1024,6 +1073,49 @@ def _generate_hexdump(data: bytes) -> str:
     return "\n".join(hex_lines)
 
 
+def _thread_message_epoch(email_entry: dict[str, Any]) -> int:
+    try:
+        return int(email_entry.get("epoch", 0))
+    except (TypeError, ValueError):
+        # Treat an unparseable epoch as early, so the message is still fetched
+        return 0
+
+
+def _thread_messages_ids(thread_data: Any, stop_subject: str | None) -> set[str]:
+    message_ids: set[str] = set()
+    skipped_ids: set[str] = set()
+    if not isinstance(thread_data, dict):
+        return message_ids
+    emails = thread_data.get("emails", [])
+    stop_epoch = _thread_messages_stop_epoch(emails, stop_subject) if (stop_subject is not None) else None
+    for email_entry in emails:
+        if isinstance(email_entry, dict) and (mid := email_entry.get("id")):
+            if (stop_epoch is not None) and (_thread_message_epoch(email_entry) >= stop_epoch):
+                skipped_ids.add(str(mid))
+            else:
+                message_ids.add(str(mid))
+    _thread_messages_walk(thread_data.get("thread"), message_ids)
+    # The walk has no subject metadata, so remove skipped messages it re-added
+    return message_ids - skipped_ids
+
+
+def _thread_messages_stop_epoch(emails: Any, stop_subject: str) -> int | None:
+    """Find the epoch of the earliest message whose subject contains stop_subject."""
+    stop_epoch: int | None = None
+    for email_entry in emails:
+        if not isinstance(email_entry, dict):
+            continue
+        if stop_subject not in str(email_entry.get("subject", "")):
+            continue
+        epoch = _thread_message_epoch(email_entry)
+        if epoch <= 0:
+            # Cannot order a message without an epoch, so do not stop on it
+            continue
+        if (stop_epoch is None) or (epoch < stop_epoch):
+            stop_epoch = epoch
+    return stop_epoch
+
+
 def _thread_messages_walk(node: dict[str, Any] | None, message_ids: set[str]) -> None:
     if not isinstance(node, dict):
         return